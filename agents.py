@@ -10,13 +10,12 @@ Since: 2020-04
 from fairpy.items.valuations import *
 from fairpy.cake.valuations  import *
 
-from abc import ABC, abstractmethod
 from typing import *
 Item = Any
 Bundle = Set[Item]
 
 
-class Agent(ABC):
+class Agent:
     """
     An abstract class that describes a participant in an algorithm for indivisible item allocation.
     It can evaluate a set of items.
@@ -35,6 +34,13 @@ class Agent(ABC):
         if name is not None:
             self._name = name
         self.duplicity = duplicity
+        # Bind the frequently-used methods of the valuation directly, to save a call per evaluation.
+        # Methods that are overridden by a subclass are kept.
+        for method in Agent._bound_valuation_methods:
+            if getattr(type(self), method) is getattr(Agent, method) and hasattr(valuation, method):
+                setattr(self, method, getattr(valuation, method))
+
+    _bound_valuation_methods = ("value", "is_EF", "is_EF1", "is_EFx", "value_except_best_c_goods")
 
     def name(self):
         if hasattr(self, '_name') and self._name is not None:
@@ -145,10 +145,8 @@ class Allocation:
 
         # Compute a matrix with each agent's values for all bundles:
         agent_bundle_value_matrix = np.zeros([num_of_agents,num_of_agents])
-        if hasattr(agents, 'agent_value_for_bundle'):  # E.g. when agents is a ValuationMatrix.
-            for i_agent in range(num_of_agents):
-                for i_bundle in range(num_of_agents):
-                    agent_bundle_value_matrix[i_agent,i_bundle] = agents.agent_value_for_bundle(i_agent,bundles[i_bundle])
+        if hasattr(agents, 'agent_bundle_value_matrix'):  # E.g. when agents is a ValuationMatrix - all values are computed at once.
+            agent_bundle_value_matrix[:,:] = agents.agent_bundle_value_matrix(bundles)
         elif hasattr(next(iter(agents)), 'value'):              # E.g. when agents is a list of Agent objects
             for i_agent in range(num_of_agents):
                 for i_bundle in range(num_of_agents):
@@ -9,6 +9,7 @@ Since:  2021-04
 """
 
 from fairpy import Allocation, valuations
+from fairpy.items.bag_filling_numba import one_directional_bag_filling_kernel
 from typing import List
 import numpy as np
 
@@ -56,6 +57,7 @@ class Bag:
 		"""
 		self.values = valuations.matrix_from(values)
 		self.thresholds = thresholds
+		self.map_agent_to_bag_value = np.zeros(self.values.num_of_agents, dtype=np.float64)  # reused in all resets
 		self.reset()
 
 	def reset(self): 
@@ -63,7 +65,7 @@ class Bag:
 		Empty the bag.
 		"""
 		self.objects = []
-		self.map_agent_to_bag_value = np.zeros(self.values.num_of_agents)
+		self.map_agent_to_bag_value.fill(0)
 		logger.info("Starting an empty bag. %d agents and %d objects.", self.values.num_of_agents, self.values.num_of_objects)
 
 	def append(self, object:int):
@@ -76,8 +78,7 @@ class Bag:
 			return
 		logger.info("   Appending object %s.", object)
 		self.objects.append(object)
-		for agent in self.values.agents():
-			self.map_agent_to_bag_value[agent] += self.values[agent][object]
+		self.map_agent_to_bag_value += self.values._v[:, object]
 		logger.debug("      Bag values: %s.", self.map_agent_to_bag_value)
 
 	def willing_agent(self, remaining_agents)->int:
@@ -119,15 +120,28 @@ class Bag:
 		"""
 		if len(remaining_agents)==0:
 			return (None, None)
-		willing_agent = self.willing_agent(remaining_agents)
-		if willing_agent is not None:
-			return (willing_agent, self.objects)
-		for object in remaining_objects:
-			self.append(object)
-			willing_agent = self.willing_agent(remaining_agents)
-			if willing_agent is not None:
-				return (willing_agent, self.objects)
-		return (None, None)
+		remaining_objects = list(remaining_objects)
+		remaining_agents = np.asarray(remaining_agents, dtype=np.intp)
+
+		# partial_values[a,k] = the value of agent a to the bag after the first k remaining objects are appended:
+		partial_values = np.cumsum(np.column_stack((
+			self.map_agent_to_bag_value, self.values._v[:, remaining_objects])), axis=1)
+		is_willing = partial_values[remaining_agents] >= np.asarray(self.thresholds, dtype=np.float64)[remaining_agents, np.newaxis]
+		map_agent_to_num_of_objects = np.where(is_willing.any(axis=1), is_willing.argmax(axis=1), len(remaining_objects)+1)
+		i_willing_agent = map_agent_to_num_of_objects.argmin()   # the first agent among those who need the fewest objects
+		num_of_objects = map_agent_to_num_of_objects[i_willing_agent]
+		if num_of_objects > len(remaining_objects):
+			willing_agent, num_of_objects = None, len(remaining_objects)
+		else:
+			willing_agent = int(remaining_agents[i_willing_agent])
+
+		logger.info("   Appending objects %s.", remaining_objects[:num_of_objects])
+		self.objects.extend(remaining_objects[:num_of_objects])
+		self.map_agent_to_bag_value[:] = partial_values[:, num_of_objects]
+		logger.debug("      Bag values: %s.", self.map_agent_to_bag_value)
+		if willing_agent is None:
+			return (None, None)
+		return (willing_agent, self.objects)
 
 	def __str__(self):
 		return f"Bag objects: {self.objects}, values: {self.map_agent_to_bag_value}"
@@ -182,19 +196,21 @@ def one_directional_bag_filling(values, thresholds:List[float]):
 	Agent #0 gets None with value 0.
 	Agent #1 gets {0} with value 44.
 	<BLANKLINE>
+	>>> one_directional_bag_filling([], thresholds=[]).num_of_agents
+	0
 	"""
 	values = valuations.matrix_from(values)
 	if len(thresholds) != values.num_of_agents:
 		raise ValueError(f"Number of valuations {values.num_of_agents} differs from number of thresholds {len(thresholds)}")
 
-	allocation = SequentialAllocation(values.agents(), values.objects(), logger)
-	bag = Bag(values, thresholds)
-	while True:
-		(willing_agent, allocated_objects) = bag.fill(allocation.remaining_objects, allocation.remaining_agents)
-		if willing_agent is None:  break
-		allocation.let_agent_get_objects(willing_agent, allocated_objects)
-		bag.reset()
-	return Allocation(values, allocation.bundles)
+	value_array = np.asarray(values._v, dtype=np.float64).reshape(   # 2-dimensional even when there are no agents
+		values.num_of_agents, values.num_of_objects)
+	bags = one_directional_bag_filling_kernel(value_array, np.asarray(thresholds, dtype=np.float64))
+	bundles = values.num_of_agents*[None]
+	for (agent, first, end) in bags.tolist():
+		bundles[agent] = list(range(first, end))
+		logger.info("Agent %d takes the bag with objects %s.", agent, bundles[agent])
+	return Allocation(values, bundles)
 
 
 
@@ -0,0 +1,133 @@
+#!python3
+
+"""
+Compiled kernels for bag-filling procedures.
+
+The kernels work on the raw valuation ndarray, so the whole filling loop runs without
+  Python-level iteration. If numba is not installed, the same code runs as plain Python.
+
+Since:  2026-10
+"""
+
+import numpy as np
+
+try:
+	from numba import njit
+except ImportError:   # numba is optional - without it, the kernel is just a Python function.
+	def njit(*args, **kwargs):
+		return lambda function: function
+
+
+@njit(cache=True, boundscheck=False, error_model="numpy")
+def _willing_agent(bag_values:np.ndarray, thresholds:np.ndarray, remaining_agents:np.ndarray)->int:
+	for agent in range(len(bag_values)):
+		if remaining_agents[agent] and bag_values[agent] >= thresholds[agent]:
+			return agent
+	return -1
+
+
+@njit(cache=True, boundscheck=False, error_model="numpy")
+def one_directional_bag_filling_kernel(values:np.ndarray, thresholds:np.ndarray)->np.ndarray:
+	"""
+	Runs one-directional bag-filling: the bag is filled with the remaining objects in their given order,
+	  until some remaining agent is willing to take it.
+	Hence, the remaining objects are always a suffix [first,num_of_objects).
+
+	:param values: a float matrix (a row for each agent, a column for each object).
+	:param thresholds: a float array with the minimum value each agent accepts.
+	:return an int matrix with a row (agent, first, end) for each allocated bag, in order of allocation.
+	  The bag contains the objects [first, first+1, ..., end-1].
+
+	>>> values = np.array([[11,33],[44,22]], dtype=float)
+	>>> one_directional_bag_filling_kernel(values, np.array([30.,30.]))
+	array([[1, 0, 1],
+	       [0, 1, 2]])
+	>>> one_directional_bag_filling_kernel(values, np.array([40.,30.]))
+	array([[1, 0, 1]])
+	"""
+	num_of_agents, num_of_objects = values.shape
+	remaining_agents = np.ones(num_of_agents, dtype=np.bool_)
+	bag_values = np.zeros(num_of_agents)
+	bags = np.empty((num_of_agents, 3), dtype=np.int64)
+	num_of_bags = 0
+	first = 0
+	while num_of_bags < num_of_agents:
+		bag_values[:] = 0
+		willing_agent = _willing_agent(bag_values, thresholds, remaining_agents)
+		end = first
+		while willing_agent < 0 and end < num_of_objects:
+			for agent in range(num_of_agents):
+				bag_values[agent] += values[agent, end]
+			end += 1
+			willing_agent = _willing_agent(bag_values, thresholds, remaining_agents)
+		if willing_agent < 0:
+			break
+
+		bags[num_of_bags, 0] = willing_agent
+		bags[num_of_bags, 1] = first
+		bags[num_of_bags, 2] = end
+		num_of_bags += 1
+		remaining_agents[willing_agent] = False
+		first = end
+	return bags[:num_of_bags]
+
+
+@njit(cache=True, boundscheck=False, error_model="numpy")
+def bidirectional_bag_filling_kernel(values:np.ndarray, thresholds:np.ndarray)->np.ndarray:
+	"""
+	Runs bi-directional bag-filling on an ordered instance (object 0 is the most valuable for all agents, etc.).
+	In each iteration, the bag is initialized with the highest-valued remaining object,
+	  and filled with the lowest-valued remaining objects until some remaining agent is willing to take it.
+	Hence, the remaining objects are always a contiguous range [first,last].
+
+	:param values: a float matrix (a row for each agent, a column for each object).
+	:param thresholds: a float array with the minimum value each agent accepts.
+	:return an int matrix with a row (agent, first, last, bottom) for each allocated bag, in order of allocation.
+	  The bag contains the objects [first, last, last-1, ..., bottom].
+
+	>>> values = np.array(3*[[97,96,90,12,3,2,1,1,1]], dtype=float)
+	>>> bidirectional_bag_filling_kernel(values, np.array([100.,100.,100.]))
+	array([[0, 0, 8, 6],
+	       [1, 1, 5, 4],
+	       [2, 2, 3, 3]])
+	>>> bidirectional_bag_filling_kernel(values, np.array([101.,101.,101.]))
+	array([[0, 0, 8, 5],
+	       [1, 1, 4, 3]])
+	"""
+	num_of_agents, num_of_objects = values.shape
+	remaining_agents = np.ones(num_of_agents, dtype=np.bool_)
+	bag_values = np.zeros(num_of_agents)
+	bags = np.empty((num_of_agents, 4), dtype=np.int64)
+	num_of_bags = 0
+	first, last = 0, num_of_objects-1
+	while first <= last and num_of_bags < num_of_agents:
+		# Initialize a bag with the highest-valued object:
+		for agent in range(num_of_agents):
+			bag_values[agent] = values[agent, first]
+		willing_agent = _willing_agent(bag_values, thresholds, remaining_agents)
+
+		# Fill the bag with the lowest-valued objects:
+		bottom = last+1
+		while willing_agent < 0 and bottom-1 > first:
+			bottom -= 1
+			for agent in range(num_of_agents):
+				bag_values[agent] += values[agent, bottom]
+			willing_agent = _willing_agent(bag_values, thresholds, remaining_agents)
+		if willing_agent < 0:
+			break
+
+		bags[num_of_bags, 0] = willing_agent
+		bags[num_of_bags, 1] = first
+		bags[num_of_bags, 2] = last
+		bags[num_of_bags, 3] = bottom
+		num_of_bags += 1
+		remaining_agents[willing_agent] = False
+		first, last = first+1, bottom-1
+	return bags[:num_of_bags]
+
+
+
+if __name__ == "__main__":
+	import doctest
+	(failures,tests) = doctest.testmod(report=True)
+	print ("{} failures, {} tests".format(failures,tests))
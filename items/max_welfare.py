@@ -40,7 +40,7 @@ def max_welfare_allocation(agents, welfare_function, welfare_constraint_function
 		z[i][o] >= 0 for i in v.agents()
 		for o in v.objects()
 	]
-	utilities = [sum([z[i][o]*v[i][o] for o in v.objects()]) for i in v.agents()]
+	utilities = [sum([z[i][o]*v.at(i,o) for o in v.objects()]) for i in v.agents()]
 	if welfare_constraint_function is not None:
 		welfare_constraints = [welfare_constraint_function(utility) for utility in utilities]
 	else:
@@ -78,7 +78,7 @@ def max_welfare_allocation_for_families(agents, families:list, welfare_function,
 		z[f][o] >= 0 for f in range(num_of_families)
 		for o in v.objects()
 	]
-	utilities = [sum([z[map_agent_to_family[i]][o]*v[i][o] for o in v.objects()]) for i in v.agents()]
+	utilities = [sum([z[map_agent_to_family[i]][o]*v.at(i,o) for o in v.objects()]) for i in v.agents()]
 
 	if welfare_constraint_function is not None:
 		welfare_constraints = [welfare_constraint_function(utility) for utility in utilities]
@@ -270,7 +270,7 @@ def leximin_optimal_allocation(agents) -> AllocationMatrix:
 		z[i][o] >= 0 for i in v.agents()
 		for o in v.objects()
 	]
-	utilities = [sum([z[i][o]*v[i][o] for o in v.objects()]) for i in v.agents()]
+	utilities = [sum([z[i][o]*v.at(i,o) for o in v.objects()]) for i in v.agents()]
 
 	def max_minimum_with_fixed_agents(map_fixed_agent_to_fixed_utility:dict):
 		fixed_agents = map_fixed_agent_to_fixed_utility.keys()
@@ -371,7 +371,7 @@ def leximin_optimal_allocation_for_families(agents, families:list) -> Allocation
 		z[f][o] >= 0 for f in range(num_of_families)
 		for o in v.objects()
 	]
-	utilities = [sum([z[map_agent_to_family[i]][o]*v[i][o] for o in v.objects()]) for i in v.agents()]
+	utilities = [sum([z[map_agent_to_family[i]][o]*v.at(i,o) for o in v.objects()]) for i in v.agents()]
 
 	def max_minimum_with_fixed_agents(map_fixed_agent_to_fixed_utility:dict):
 		fixed_agents = map_fixed_agent_to_fixed_utility.keys()
@@ -140,8 +140,8 @@ class ConsumptionGraph():
         sum = 0
         part = 0
         for i in range(0, self.num_of_objects):
-            sum += valuation_matrix[x][i]
-            part += valuation_matrix[x][i] * self.__graph[x][i]
+            sum += valuation_matrix.at(x,i)
+            part += valuation_matrix.at(x,i) * self.__graph[x][i]
         sum = sum / valuation_matrix.num_of_agents
         return part >= sum
 
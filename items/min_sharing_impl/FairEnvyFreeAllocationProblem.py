@@ -101,7 +101,7 @@ class FairEnvyFreeAllocationProblem(FairAllocationProblem):
         for i in self.valuation.agents():
             agent_sum = 0
             for j in self.valuation.objects():
-                agent_sum += mat[i][j] * self.valuation[i][j]
+                agent_sum += mat[i][j] * self.valuation.at(i,j)
                 if (consumption_graph.get_graph()[i][j] == 0):
                     constraints.append(mat[i][j] == 0)
                 else:
@@ -110,7 +110,7 @@ class FairEnvyFreeAllocationProblem(FairAllocationProblem):
             for j in self.valuation.agents():
                 anther_agent_sum = 0
                 for k in self.valuation.objects():
-                    anther_agent_sum += mat[j][k] * self.valuation[i][k]
+                    anther_agent_sum += mat[j][k] * self.valuation.at(i,k)
                 constraints.append(agent_sum >= anther_agent_sum)
         # the sum of each column is 1 (the property on each object is 100%)
         for i in self.valuation.objects():
@@ -74,7 +74,7 @@ class FairMaxProductAllocationProblem(FairThresholdAllocationProblem):
         thresholds = mpa_utilities * (1-tolerance)
         logger.info("The thresholds are: %s",thresholds)
         logger.info("The proportionality thresholds are: %s", [
-            sum(valuation_matrix[i]) / valuation_matrix.num_of_agents 
+            sum(valuation_matrix.row(i)) / valuation_matrix.num_of_agents 
             for i in valuation_matrix.agents()])
         self.tolerance = tolerance
         super().__init__(valuation_matrix, thresholds)
@@ -84,7 +84,7 @@ class FairProportionalAllocationProblem(FairThresholdAllocationProblem):
     def __init__(self, valuation_matrix):
         valuation_matrix = valuations.matrix_from(valuation_matrix)
         thresholds = [
-            sum(valuation_matrix[i]) / valuation_matrix.num_of_agents 
+            sum(valuation_matrix.row(i)) / valuation_matrix.num_of_agents 
             for i in valuation_matrix.agents()]
         logger.info("The proportionality thresholds are: %s",thresholds)
         super().__init__(valuation_matrix, thresholds)
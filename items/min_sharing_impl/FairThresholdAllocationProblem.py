@@ -122,7 +122,7 @@ class FairThresholdAllocationProblem(FairAllocationProblem):
                 else:
                     logger.info("graph[%d][%d]>0",i,j)
                     constraints.append(mat[i][j] >= 0)
-                total_value_of_agent_i += mat[i][j] * self.valuation[i][j]
+                total_value_of_agent_i += mat[i][j] * self.valuation.at(i,j)
             constraints.append(total_value_of_agent_i >= self.thresholds[i])
         # the sum of each column is 1 (the property on each object is 100%)
         for i in self.valuation.objects():
@@ -117,7 +117,7 @@ class GraphGenerator():
         if (i == 0):
             arr = []
             # the first agent gets all the objects
-            arr.append([1] * len(self.valuation_matrix[0]))
+            arr.append([1] * len(self.valuation_matrix.row(0)))
             yield ConsumptionGraph(arr)
         else:
             for g in genneretor:
@@ -115,13 +115,13 @@ def compute_all_ratios(valuation_matrix)->list:
         mat = np.zeros((valuation_matrix.num_of_agents, valuation_matrix.num_of_objects)).tolist()
         for j in valuation_matrix.agents():
             for k in valuation_matrix.objects():
-                if (valuation_matrix[i][k]==0) and (valuation_matrix[j][k]==0):
+                if (valuation_matrix.at(i,k)==0) and (valuation_matrix.at(j,k)==0):
                     temp = 1.0
                 else:
-                    if(valuation_matrix[j][k]==0):
+                    if(valuation_matrix.at(j,k)==0):
                         temp = np.inf
                     else:
-                        temp = valuation_matrix[i][k] / valuation_matrix[j][k]
+                        temp = valuation_matrix.at(i,k) / valuation_matrix.at(j,k)
                 mat[j][k] = (k,temp)
         ans.append(mat)
     return ans
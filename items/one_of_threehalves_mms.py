@@ -8,9 +8,10 @@ Since:  2021-04
 
 import fairpy.valuations as valuations
 from fairpy.allocations import Allocation
-from fairpy.items.bag_filling import Bag, SequentialAllocation
+from fairpy.items.bag_filling_numba import bidirectional_bag_filling_kernel
 
 from typing import List
+import numpy as np
 
 import logging
 logger = logging.getLogger(__name__)
@@ -33,29 +34,23 @@ def bidirectional_bag_filling(valuation_matrix, thresholds:List[float]) -> Alloc
 	Agent #1 gets {1,3,4} with value 111.
 	Agent #2 gets None with value 0.
 	<BLANKLINE>
+	>>> bidirectional_bag_filling([], thresholds=[]).num_of_agents
+	0
 	"""
 	valuation_matrix = valuations.matrix_from(valuation_matrix)
 	valuation_matrix.verify_ordered()
 	if len(thresholds) != valuation_matrix.num_of_agents:
 		raise ValueError(f"Number of valuations {valuation_matrix.num_of_agents} differs from number of thresholds {len(thresholds)}")
 
-	allocation = SequentialAllocation(valuation_matrix.agents(), valuation_matrix.objects(), logger)
-	bag = Bag(valuation_matrix, thresholds)
-	while True:
-		if len(allocation.remaining_objects)==0:  break
+	values = np.asarray(valuation_matrix._v, dtype=np.float64).reshape(   # 2-dimensional even when there are no agents
+		valuation_matrix.num_of_agents, valuation_matrix.num_of_objects)
+	bags = bidirectional_bag_filling_kernel(values, np.asarray(thresholds, dtype=np.float64))
+	bundles = valuation_matrix.num_of_agents*[None]
+	for (agent, first, last, bottom) in bags.tolist():
+		bundles[agent] = [first] + list(range(last, bottom-1, -1))
+		logger.info("Agent %d takes the bag with objects %s.", agent, bundles[agent])
+	return Allocation(valuation_matrix, bundles)
 
-		# Initialize a bag with the highest-valued object:
-		highest_valued_object = allocation.remaining_objects[0]
-		bag.append(highest_valued_object)
-
-		# Fill the bag with the lowest-valued objects:
-		lowest_valued_objects = reversed(allocation.remaining_objects[1:])
-		(willing_agent, allocated_objects) = bag.fill(lowest_valued_objects, allocation.remaining_agents)
-		if willing_agent is None: break
-		allocation.let_agent_get_objects(willing_agent, allocated_objects)
-		bag.reset()
-
-	return Allocation(valuation_matrix, allocation.bundles)
 
 
 
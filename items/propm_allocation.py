@@ -51,7 +51,7 @@ def divide(v: ValuationMatrix) -> List[List[int]]:
     [[4, 5, 0], [1], [2, 3]]
     """
     total_value = v.verify_normalized()
-    item_order = sorted(v.objects(), key=lambda j: v[0, j])
+    item_order = sorted(v.objects(), key=lambda j: v.at(0, j))
 
     bundles = []
     divided_items_count = 0
@@ -60,9 +60,9 @@ def divide(v: ValuationMatrix) -> List[List[int]]:
         bundle_value = 0
         item_index = divided_items_count
         while item_index < v.num_of_objects and (
-                bundle_value + v[0, item_order[item_index]]) * (
+                bundle_value + v.at(0, item_order[item_index])) * (
                 v.num_of_agents - bundle_index) + divided_value <= total_value:
-            bundle_value += v[0, item_order[item_index]]
+            bundle_value += v.at(0, item_order[item_index])
             item_index += 1
 
         bundles.append(
@@ -220,9 +220,9 @@ def solve(agents) -> List[List[int]]:
 
     for agent in v.agents():
         for item in v.objects():
-            if v[agent][item] * v.num_of_agents > total_value:
+            if v.at(agent, item) * v.num_of_agents > total_value:
                 logger.info("Allocating item %d to agent %d as she values it as %f > 1/n", item, agent,
-                            v[agent][item] / total_value)
+                            v.at(agent, item) / total_value)
 
                 allocation = solve(v.without_agent(agent).without_object(object))
                 insert_agent_into_allocation(agent, item, allocation)
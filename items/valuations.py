@@ -15,6 +15,7 @@ from dicttools import stringify
 
 import math, itertools
 from fractions import Fraction
+import numpy as np
 
 from fairpy.items import partitions  # Works in Python 3.8
 
@@ -299,8 +300,24 @@ class MonotoneValuation(Valuation):
         self.map_bundle_to_value = {frozenset(bundle):value for bundle,value in  map_bundle_to_value.items()}
         self.map_bundle_to_value[frozenset()] = 0   # normalization: the value of the empty bundle is always 0
         desired_items = max(map_bundle_to_value.keys(), key=lambda k:map_bundle_to_value[k])
+        # Each item gets a bit, so that a bundle can be used as a cache key by its bitmask:
+        self._item_bit = {item:1<<index for index,item in enumerate(frozenset().union(*self.map_bundle_to_value.keys()))}
+        self._value_except_best_c_goods_cache = {}
+        self._value_except_worst_c_goods_cache = {}
         super().__init__(desired_items)
 
+    def _bundle_mask(self, bundle:Bundle)->int:
+        """
+        :return a bitmask of the items in the given bundle. Items that were not seen yet get new bits.
+        """
+        mask = 0
+        for item in bundle:
+            bit = self._item_bit.get(item)
+            if bit is None:
+                bit = self._item_bit[item] = 1 << len(self._item_bit)
+            mask |= bit
+        return mask
+
     def value(self, bundle:Bundle)->int:
         """
         Calculates the agent's value for the given set of goods.
@@ -311,6 +328,36 @@ class MonotoneValuation(Valuation):
         else:
             raise ValueError(f"The value of {bundle} is not specified in the valuation function")
 
+    def value_except_best_c_goods(self, bundle:Bundle, c:int=1)->int:
+        """
+        Calculates the value of the given bundle when the "best" (at most) c goods are removed from it.
+        This requires checking all subsets of c goods, so the result is cached for each bundle and c.
+
+        >>> a = MonotoneValuation({"x": 1, "y": 2, "xy": 4})
+        >>> a.value_except_best_c_goods(set("xy"), c=1)
+        1
+        >>> a.value_except_best_c_goods({"y","x"}, c=1)
+        1
+        """
+        key = (self._bundle_mask(bundle), c)
+        if key not in self._value_except_best_c_goods_cache:
+            self._value_except_best_c_goods_cache[key] = super().value_except_best_c_goods(bundle, c)
+        return self._value_except_best_c_goods_cache[key]
+
+    def value_except_worst_c_goods(self, bundle:Bundle, c:int=1)->int:
+        """
+        Calculates the value of the given bundle when the "worst" c goods are removed from it.
+        This requires checking all subsets of c goods, so the result is cached for each bundle and c.
+
+        >>> a = MonotoneValuation({"x": 1, "y": 2, "xy": 4})
+        >>> a.value_except_worst_c_goods(set("xy"), c=1)
+        2
+        """
+        key = (self._bundle_mask(bundle), c)
+        if key not in self._value_except_worst_c_goods_cache:
+            self._value_except_worst_c_goods_cache[key] = super().value_except_worst_c_goods(bundle, c)
+        return self._value_except_worst_c_goods_cache[key]
+
     def __repr__(self):
         return f"Monotone valuation on {sorted(self.desired_items)}."
 
@@ -405,6 +452,17 @@ class AdditiveValuation(Valuation):
     33
     >>> a.all_items()
     {0, 1, 2, 3}
+
+    >>> ### Initialize from another additive valuation
+    >>> b = AdditiveValuation(AdditiveValuation({"x": 1, "y": 2, "z": 4, "w":0}))
+    >>> b
+    Additive valuation: w=0 x=1 y=2 z=4.
+    >>> sorted(b.desired_items)
+    ['x', 'y', 'z']
+    >>> b.value({"y","x","z"})
+    7
+    >>> list(b.all_items())
+    ['x', 'y', 'z', 'w']
     """
     def __init__(self, map_good_to_value, name:str=None, duplicity:int=1):
         """
@@ -413,9 +471,9 @@ class AdditiveValuation(Valuation):
         :param duplicity: the number of agents with the same valuation.
         """
         if isinstance(map_good_to_value, AdditiveValuation):
-            map_good_to_value = map_good_to_value.map_good_to_value
             desired_items = map_good_to_value.desired_items
             all_items = map_good_to_value._all_items
+            map_good_to_value = map_good_to_value.map_good_to_value
         elif isinstance(map_good_to_value, dict):
             all_items = map_good_to_value.keys()
             desired_items = set([g for g in all_items if map_good_to_value[g]>0])
@@ -499,6 +557,46 @@ class AdditiveValuation(Valuation):
         return self.value(sorted_bundle[c:])  # remove the worst c goods
 
 
+    def value_1_of_c_MMS(self, c:int=1)->int:
+        """
+        Calculates the value of the 1-out-of-c maximin-share ( https://en.wikipedia.org/wiki/Maximin-share )
+
+        The MMS is at most the total value divided by c, and at most the value of all goods except the c-1 best ones.
+        First, the best partition of the goods into c contiguous groups (in descending order of value)
+        is found by dynamic programming; if it attains this upper bound, it is optimal.
+        Otherwise, all partitions are enumerated, until one of them attains the upper bound.
+
+        >>> a = AdditiveValuation({"x": 1, "y": 2, "z": 4, "w":0})
+        >>> a.value_1_of_c_MMS(c=2)
+        3
+        >>> a = AdditiveValuation({"a": 4, "b": 3, "c": 3, "d": 2})   # the best partition {a,d},{b,c} is not contiguous
+        >>> a.value_1_of_c_MMS(c=2)
+        6
+        >>> a.value_1_of_c_MMS(c=3)
+        3
+        >>> a.value_1_of_c_MMS(c=5)
+        0
+        """
+        if c > len(self.desired_items):
+            return 0
+        items = sorted(self.desired_items_list, key=lambda item: -self.map_good_to_value[item])
+        values = [self.map_good_to_value[item] for item in items]
+        upper_bound = min(sum(values)/c, sum(values[c-1:]))
+
+        part_starts = [0] + _best_contiguous_partition(values, c)
+        part_ends = part_starts[1:] + [len(items)]
+        item_order = {item:index for index,item in enumerate(self.desired_items_list)}
+        best_value = min([  # each part is summed in the same order as in values_1_of_c_partitions
+            self.value(sorted(items[start:end], key=item_order.__getitem__))
+            for start,end in zip(part_starts,part_ends)])
+        if best_value >= upper_bound:
+            return best_value
+        for value in self.values_1_of_c_partitions(c):
+            best_value = max(best_value, value)
+            if best_value >= upper_bound:
+                break
+        return best_value
+
     def value_of_cth_best_good(self, c:int)->int:
         """
         Return the value of the agent's c-th most valuable good.
@@ -528,6 +626,37 @@ class AdditiveValuation(Valuation):
 
 
 
+def _best_contiguous_partition(values:List[float], c:int)->List[int]:
+    """
+    Finds a partition of the given list into c contiguous non-empty parts, that maximizes the smallest sum of a part.
+    Uses dynamic programming on the prefix sums, in time O(c*m^2) where m is the length of the list.
+    :return the start indices of parts 2,...,c.
+
+    >>> _best_contiguous_partition([4,3,3,2], 2)
+    [2]
+    >>> _best_contiguous_partition([5,1,1,1,1,1], 3)
+    [1, 3]
+    >>> _best_contiguous_partition([5,1,1], 1)
+    []
+    """
+    num_of_values = len(values)
+    prefix_sums = np.concatenate([[0], np.cumsum(np.asarray(values, dtype=float))])
+    part_sums = prefix_sums[np.newaxis,:] - prefix_sums[:,np.newaxis]   # part_sums[i,j] = sum(values[i:j])
+    part_sums[np.tril_indices(num_of_values+1)] = -np.inf                # parts must be non-empty
+    best = part_sums[0]       # best[j] = the best smallest-sum when values[:j] is partitioned into k parts (now k=1).
+    best_part_starts = []     # best_part_starts[k-2][j] = the start of the k-th part in that best partition.
+    for k in range(2, c+1):
+        candidates = np.minimum(best[:,np.newaxis], part_sums)  # candidates[i,j]: values[:i] in k-1 parts, values[i:j] in one part.
+        best_part_starts.append(candidates.argmax(axis=0))
+        best = candidates.max(axis=0)
+    part_starts = []
+    end = num_of_values
+    for starts in reversed(best_part_starts):
+        end = starts[end]
+        part_starts.append(int(end))
+    return part_starts[::-1]
+
+
 class BinaryValuation(Valuation):
     """
     Represents an additive binary valuation function.
@@ -584,8 +713,19 @@ class BinaryValuation(Valuation):
         return len(self.desired_items.intersection(bundle))
 
     def value_except_best_c_goods(self, bundle:Bundle, c:int=1)->int:
+        """
+        The best c goods are desired goods (as long as there are any), so removing them decreases the value by at most c.
+
+        >>> a = BinaryValuation({"x","y","z"})
+        >>> a.value_except_best_c_goods({"x","y","w"}, c=1)
+        1
+        >>> a.value_except_best_c_goods({"x","v","w"}, c=2)
+        0
+        >>> a.value_except_best_c_goods({"x","y"}, c=2)
+        0
+        """
         if len(bundle) <= c: return 0
-        return self.value(bundle) - c
+        return max(0, self.value(bundle) - c)
 
     def value_except_worst_c_goods(self, bundle:Bundle, c:int=1)->int:
         if len(bundle) <= c: return 0
@@ -12,6 +12,7 @@ Since:  2021-03
 
 import numpy as np
 from typing import *
+from fairpy.valuations_numba import agent_bundle_value_kernel, use_agent_bundle_value_kernel
 
 class ValuationMatrix:
     """
@@ -24,6 +25,10 @@ class ValuationMatrix:
     * A list of lists;
     * Another ValuationMatrix.
 
+    The values are kept in a C-contiguous numeric ndarray, so that row operations run on contiguous memory.
+    Non-numeric input (e.g. strings, or rows of different lengths) is rejected; boolean values are accepted as they are.
+    An explicit dtype can be given, e.g. np.float32 to halve the memory traffic of large computations.
+
     >>> v = ValuationMatrix([[1,4,7],[6,3,0]])    # Initialize from a list of lists
     >>> v[0,1]
     4
@@ -41,6 +46,10 @@ class ValuationMatrix:
     8
     >>> v.agent_value_for_bundle(1, [1,0])
     9
+    >>> v.agent_value_for_bundle(1, {1,2})
+    3
+    >>> v.agent_value_for_bundle(1, [])
+    0
     >>> v.agent_value_for_bundle(1, None)
     0
     >>> v.without_agent(0)
@@ -58,23 +67,42 @@ class ValuationMatrix:
     >>> v2
     [[1. 1. 1.]
      [1. 1. 1.]]
+    >>> ValuationMatrix(np.ones([3,2]).T)._v.flags.c_contiguous
+    True
+    >>> ValuationMatrix([[1,4,7],[6,3,0]], dtype=np.float32)[0]
+    array([1., 4., 7.], dtype=float32)
+    >>> ValuationMatrix(np.array([[1,2],[3]], dtype=object))
+    Traceback (most recent call last):
+    ...
+    ValueError: Valuation matrix should be numeric, but its dtype is object
+    >>> ValuationMatrix([['a','b']])
+    Traceback (most recent call last):
+    ...
+    ValueError: Valuation matrix should be numeric, but its dtype is <U1
+    >>> ValuationMatrix([[True,False]])
+    [[ True False]]
     """
     
-    def __init__(self, valuation_matrix: np.ndarray):
+    def __init__(self, valuation_matrix: np.ndarray, dtype=None):
         if isinstance(valuation_matrix, list):
             valuation_matrix = np.array(valuation_matrix)
         elif isinstance(valuation_matrix, ValuationMatrix):
             valuation_matrix = valuation_matrix._v
 
+        valuation_matrix = np.ascontiguousarray(valuation_matrix, dtype=dtype)   # no copy if already contiguous (and of that dtype)
+        if not (np.issubdtype(valuation_matrix.dtype, np.number) or valuation_matrix.dtype == np.bool_):
+            raise ValueError(f"Valuation matrix should be numeric, but its dtype is {valuation_matrix.dtype}")
         self._v = valuation_matrix
         self.num_of_agents = len(valuation_matrix)
         self.num_of_objects = 0 if self.num_of_agents == 0 else len(valuation_matrix[0])
+        self._agents = range(self.num_of_agents)
+        self._objects = range(self.num_of_objects)
 
     def agents(self):
-        return range(self.num_of_agents)
+        return self._agents
 
     def objects(self):
-        return range(self.num_of_objects)
+        return self._objects
 
     def __getitem__(self, key):
         if isinstance(key,tuple):
@@ -82,11 +110,152 @@ class ValuationMatrix:
         else:
             return self._v[key]             # agent's values for all objects
 
+    def at(self, agent:int, object:int)->float:
+        """
+        :return the agent's value for a single object (like v[agent,object], without the dispatch on the key type).
+
+        >>> ValuationMatrix([[1,4,7],[6,3,0]]).at(1,0)
+        6
+        """
+        return self._v[agent, object]
+
+    def row(self, agent:int)->np.ndarray:
+        """
+        :return the agent's values for all objects (like v[agent], without the dispatch on the key type).
+
+        >>> ValuationMatrix([[1,4,7],[6,3,0]]).row(1)
+        array([6, 3, 0])
+        """
+        return self._v[agent]
+
     def agent_value_for_bundle(self, agent:int, bundle:List[int])->float:
         if bundle is None:
             return 0
+        elif isinstance(bundle, np.ndarray):
+            indices = bundle
+        elif isinstance(bundle, (list,tuple)):
+            indices = np.asarray(bundle, dtype=np.intp)
         else:
-            return sum([self._v[agent][object] for object in bundle])
+            indices = np.fromiter(bundle, dtype=np.intp)
+        return self._v[agent].take(indices).sum()
+
+    def bundle_count_matrix(self, bundles:List[List[int]])->np.ndarray:
+        """
+        :return a matrix with a row for each bundle and a column for each object,
+           in which entry [j,o] is the number of copies of object o in bundle j (a None bundle is empty).
+
+        >>> ValuationMatrix([[1,4,7],[6,3,0]]).bundle_count_matrix([[0,2], None, [1,1]])
+        array([[1, 0, 1],
+               [0, 0, 0],
+               [0, 2, 0]])
+        """
+        counts = np.zeros([len(bundles), self.num_of_objects], dtype=np.intp)
+        for i_bundle, bundle in enumerate(bundles):
+            if bundle is not None:
+                np.add.at(counts[i_bundle], np.fromiter(bundle, dtype=np.intp), 1)
+        return counts
+
+    def _sum_dtype(self)->np.dtype:
+        """
+        :return the dtype in which sums and differences of values are computed:
+           floating-point values keep their dtype; boolean and integer values are promoted to a signed
+           integer dtype (at least int64), so that sums are counts and differences do not wrap around.
+
+        >>> ValuationMatrix([[1,4,7]], dtype=np.float32)._sum_dtype()
+        dtype('float32')
+        >>> ValuationMatrix([[1,4,7]], dtype=np.uint8)._sum_dtype()
+        dtype('int64')
+        >>> ValuationMatrix([[True,False]])._sum_dtype()
+        dtype('int64')
+        """
+        if issubclass(self._v.dtype.type, np.inexact):
+            return self._v.dtype
+        return np.result_type(self._v.dtype, np.int64)
+
+    def agent_bundle_value_matrix(self, bundles:List[List[int]])->np.ndarray:
+        """
+        :return a matrix in which entry [i,j] is the value of agent i to bundle j,
+           computed for all agents and bundles by a single matrix product.
+
+        >>> ValuationMatrix([[1,4,7],[6,3,0]]).agent_bundle_value_matrix([[0,2], [1]])
+        array([[8, 4],
+               [6, 3]])
+        >>> ValuationMatrix(np.array([[True,False],[True,True]])).agent_bundle_value_matrix([[0,1], [1]])
+        array([[1, 0],
+               [2, 1]])
+
+        For integer values and enough agents, a parallel compiled kernel is used instead of the matrix product:
+        >>> v = ValuationMatrix(np.arange(60).reshape(20,3))
+        >>> np.array_equal(v.agent_bundle_value_matrix(20*[[0,2]]), v._v @ v.bundle_count_matrix(20*[[0,2]]).T)
+        True
+        """
+        dtype = self._sum_dtype()
+        values = self._v.astype(dtype, copy=False)
+        counts = self.bundle_count_matrix(bundles).astype(dtype, copy=False)
+        if not use_agent_bundle_value_kernel(self.num_of_agents, dtype):
+            return values @ counts.T
+        bundle_values = np.zeros([self.num_of_agents, len(bundles)], dtype=dtype)
+        agent_bundle_value_kernel(values, counts, bundle_values)
+        return bundle_values
+
+    def envy_matrix(self, bundles:List[List[int]])->np.ndarray:
+        """
+        :param bundles: a list with a bundle for each agent.
+        :return a matrix in which entry [i,j] is how much agent i envies bundle j:
+           the value of agent i to bundle j minus the value of agent i to its own bundle.
+
+        >>> ValuationMatrix([[1,4,7],[6,3,0]]).envy_matrix([[0,2], [1]])
+        array([[ 0, -4],
+               [ 3,  0]])
+        >>> ValuationMatrix([[1,4,7],[6,3,0]], dtype=np.uint8).envy_matrix([[0,2], [1]])
+        array([[ 0, -4],
+               [ 3,  0]])
+        """
+        if len(bundles) != self.num_of_agents:
+            raise ValueError(f"Numbers of agents and bundles must be identical, but they are not: {self.num_of_agents}, {len(bundles)}")
+        values = self.agent_bundle_value_matrix(bundles)
+        return values - np.diag(values)[:, np.newaxis]
+
+    def is_EF(self, bundles:List[List[int]])->np.ndarray:
+        """
+        :param bundles: a list with a bundle for each agent.
+        :return a boolean array that says, for each agent, whether it finds the allocation envy-free.
+
+        >>> ValuationMatrix([[1,4,7],[6,3,0]]).is_EF([[0,2], [1]])
+        array([ True, False])
+        >>> ValuationMatrix([[1,4,7],[6,3,0]], dtype=np.uint8).is_EF([[0,2], [1]])
+        array([ True, False])
+        >>> ValuationMatrix(np.array([[True,False],[True,True]])).is_EF([[1], [0,1]])
+        array([False,  True])
+        """
+        return (self.envy_matrix(bundles) <= 0).all(axis=1)
+
+    def is_EF1(self, bundles:List[List[int]])->np.ndarray:
+        """
+        :param bundles: a list with a bundle for each agent.
+        :return a boolean array that says, for each agent, whether it finds the allocation
+           envy-free-except-1-good (EF1).
+
+        >>> v = ValuationMatrix([[1,4,7],[6,3,0]])
+        >>> v.is_EF1([[0,2], [1]])
+        array([ True,  True])
+        >>> v.is_EF1([[0], [1,2]])
+        array([False,  True])
+        >>> v.is_EF1([[], [0,1,2]])
+        array([False,  True])
+        >>> ValuationMatrix([[1,4,7],[6,3,0]], dtype=np.uint8).is_EF1([[0], [1,2]])
+        array([False,  True])
+        >>> ValuationMatrix(np.array([[True,True,True],[True,True,False]])).is_EF1([[], [0,1,2]])
+        array([False,  True])
+        """
+        envy = self.envy_matrix(bundles)
+        # best_object_values[i,j] is the value of agent i to its best object in bundle j (0 for an empty bundle).
+        # It is filled one bundle at a time, to avoid an agents x bundles x objects temporary:
+        best_object_values = np.zeros_like(envy)
+        for i_bundle, bundle in enumerate(bundles):
+            if bundle is not None:
+                best_object_values[:, i_bundle] = self._v[:, np.fromiter(bundle, dtype=np.intp)].max(axis=1, initial=0)
+        return (envy - best_object_values <= 0).all(axis=1)
 
     def without_agent(self, agent:int)->'ValuationMatrix':
         """
@@ -103,6 +272,27 @@ class ValuationMatrix:
     def submatrix(self, agents: List[int], objects: List[int]):
         """
         :return a submatrix of this valuation matrix, containing only specified agents and objects.
+
+        >>> v = ValuationMatrix([[1,4,7],[6,3,0],[5,2,8]])
+        >>> v.submatrix([0,2], [2,0])
+        [[7 1]
+         [8 5]]
+        >>> v.without_agent(1).without_object(0)
+        [[4 7]
+         [2 8]]
+        >>> v.without_object(0).submatrix([2], [1])
+        [[8]]
+        >>> v.without_agent(-1)
+        [[1 4 7]
+         [6 3 0]]
+        >>> v.submatrix([True,False,False], [0,2])
+        [[1 7]]
+        >>> w = v.without_agent(0)
+        >>> v.normalize()
+        180
+        >>> w                                  # a copy - not affected by changes to v
+        [[6 3 0]
+         [5 2 8]]
         """
         return ValuationMatrix(self._v[np.ix_(agents, objects)])
 
@@ -117,33 +307,70 @@ class ValuationMatrix:
         Traceback (most recent call last):
         ...
         ValueError: Valuations of agent 1 are not ordered: [6 0 3]
+        >>> ValuationMatrix([]).verify_ordered()
         """
-        for i in self.agents():
-            v_i = self._v[i]
-            if any(v_i[j] < v_i[j+1] for j in range(self.num_of_objects-1)):
-                raise ValueError(f"Valuations of agent {i} are not ordered: {v_i}")
+        if self.num_of_agents == 0:
+            return
+        unordered_agents = (np.diff(self._v, axis=1) > 0).any(axis=1)
+        if unordered_agents.any():
+            i = unordered_agents.argmax()
+            raise ValueError(f"Valuations of agent {i} are not ordered: {self._v[i]}")
 
-    def normalize(self) -> int:
+    def normalize(self, target_dtype=None) -> int:
         """
         Normalize valuation matrix so that each agent has equal total value of all items.
         In case of integer values they remain integer to avoid floating point mistakes.
+        :param target_dtype: if given, the values are first converted to this dtype.
+           With a floating-point dtype (e.g. np.float32), the values are divided so that each total is 1,
+           even if they were integers; the integer path requires an integer dtype.
+
+        >>> v = ValuationMatrix([[1,2,3],[4,4,4]])
+        >>> v.normalize()
+        12
+        >>> v
+        [[2 4 6]
+         [4 4 4]]
+        >>> v = ValuationMatrix([[1.,3.],[2.,2.]])
+        >>> v.normalize()
+        1
+        >>> v
+        [[0.25 0.75]
+         [0.5  0.5 ]]
+        >>> v = ValuationMatrix([[1,3],[2,2]])
+        >>> v.normalize(target_dtype=np.float32)
+        1
+        >>> v[0]
+        array([0.25, 0.75], dtype=float32)
         """
-        total_values = np.sum(self._v, axis=1, keepdims=True)
+        if target_dtype is not None:
+            self._v = self._v.astype(target_dtype, copy=False)
+        total_values = self._v.sum(axis=1)
 
         if issubclass(self._v.dtype.type, np.integer):
             total_value = np.lcm.reduce(total_values)
-            self._v *= total_value // total_values
+            np.multiply(self._v, (total_value // total_values)[:, np.newaxis], out=self._v)
             return total_value
 
-        self._v /= total_values
+        np.divide(self._v, total_values[:, np.newaxis], out=self._v)
         return 1
 
     def verify_normalized(self) -> int:
         """
-        Check if total value of each agent is the same. Return total value.
+        Check if total value of each agent is the same (up to rounding errors, for floating-point values). Return total value.
+
+        >>> ValuationMatrix([[0.1,0.2],[0.3,0]]).verify_normalized()
+        0.30000000000000004
+        >>> ValuationMatrix([[1,2],[3,1]]).verify_normalized()
+        Traceback (most recent call last):
+        ...
+        ValueError: Valuation matrix is not normalized
         """
-        total_values = np.sum(self._v, axis=1)
-        if not np.all(total_values == total_values[0]):
+        total_values = self._v.sum(axis=1)
+        if issubclass(self._v.dtype.type, np.floating):
+            is_normalized = np.isclose(total_values, total_values[0]).all()
+        else:
+            is_normalized = np.ptp(total_values) == 0
+        if not is_normalized:
             raise ValueError("Valuation matrix is not normalized")
         return total_values[0]
 
@@ -171,17 +398,20 @@ def matrix_from(input:Any):
     >>> matrix_from({"a": {"x":1,"y":2,"z":3}, "b": {"x":4,"y":5,"z":6}})        # Initialize from a dict.
     [[1 2 3]
      [4 5 6]]
+    >>> rows = [{"x":1,"y":2}, [3,4]]
+    >>> matrix_from(rows)                  # Initialize from a list of dicts and lists.
+    [[1 2]
+     [3 4]]
+    >>> rows                               # The input is not modified.
+    [{'x': 1, 'y': 2}, [3, 4]]
     """
     if isinstance(input, ValuationMatrix):
         return input
 
-    if isinstance(input, dict):  # 1. Convert dict to list
+    if isinstance(input, dict):  # 1. Take the rows from the dict
         input = list(input.values())
-    if isinstance(input, list):  # 2. Convert list to np.ndarray
-        for i in range(len(input)):
-            if isinstance(input[i], dict):
-                input[i] = list(input[i].values())
-        input = np.array(input)
+    if isinstance(input, list):  # 2. Convert all rows to a single np.ndarray, without changing the input
+        input = np.array([list(row.values()) if isinstance(row, dict) else row for row in input])
     return ValuationMatrix(input)
 
 
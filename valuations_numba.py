@@ -0,0 +1,72 @@
+#!python3
+
+"""
+Compiled kernels for batch computations on valuation matrices.
+
+The kernels are used as an alternative to the matrix product for integer matrices,
+  for which numpy does not use BLAS (for floating-point matrices, BLAS is faster).
+If numba is not installed, the same code runs as plain Python, and should not be used.
+
+Since:  2026-10
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:   # numba is optional - without it, the kernel is just a Python function.
+    NUMBA_AVAILABLE = False
+    prange = range
+    def njit(*args, **kwargs):
+        return lambda function: function
+
+
+# The kernel is used only when there are enough agents to split between threads:
+PARALLEL_MIN_AGENTS = 16
+
+def use_agent_bundle_value_kernel(num_of_agents:int, dtype:np.dtype)->bool:
+    """
+    :return whether the compiled kernel should be used, rather than the matrix product,
+       for the given number of agents and dtype of values.
+
+    >>> use_agent_bundle_value_kernel(2, np.dtype(np.int64))
+    False
+    >>> use_agent_bundle_value_kernel(100, np.dtype(np.float64))
+    False
+    """
+    return NUMBA_AVAILABLE \
+        and num_of_agents >= PARALLEL_MIN_AGENTS \
+        and issubclass(dtype.type, np.integer)
+
+
+@njit(parallel=True, cache=True, boundscheck=False)
+def agent_bundle_value_kernel(values:np.ndarray, counts:np.ndarray, out:np.ndarray):
+    """
+    Computes out = values @ counts.T, in parallel over the agents.
+
+    :param values: a matrix with a row for each agent and a column for each object.
+    :param counts: a matrix with a row for each bundle and a column for each object.
+    :param out: a zero matrix with a row for each agent and a column for each bundle; it is filled in-place.
+
+    >>> out = np.zeros((2,2), dtype=int)
+    >>> agent_bundle_value_kernel(np.array([[1,4,7],[6,3,0]]), np.array([[1,0,1],[0,1,0]]), out)
+    >>> out
+    array([[8, 4],
+           [6, 3]])
+    """
+    num_of_agents, num_of_objects = values.shape
+    num_of_bundles = counts.shape[0]
+    for agent in prange(num_of_agents):
+        for bundle in range(num_of_bundles):
+            value = out[agent, bundle]
+            for object in range(num_of_objects):
+                value += values[agent, object] * counts[bundle, object]
+            out[agent, bundle] = value
+
+
+
+if __name__ == "__main__":
+    import doctest
+    (failures,tests) = doctest.testmod(report=True)
+    print ("{} failures, {} tests".format(failures,tests))